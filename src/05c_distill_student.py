@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+05c_distill_student.py
+知识蒸馏：用 models/bert_ner 与 models/bert_clausecls 两个教师在无标注候选句上的软标签，
+训练 student_model.py 中的轻量字符级学生模型（CPU 友好）。
+输入：data/candidates/rule_candidates.jsonl（默认剔除与 data/labeled/clauses_labeled.jsonl 重叠的文本：
+      候选句是该文件某句的子串或包含某句即剔除；该文件是 11_compare_extractors.py 的评测集）
+输出：models/student/
+
+使用示例：
+  python src/05c_distill_student.py --epochs 30 --temperature 2.0
+"""
+import argparse, json, os, random
+import torch
+import torch.nn.functional as F
+from transformers import BertTokenizerFast, BertForTokenClassification, BertForSequenceClassification
+from student_model import CharStudent, build_vocab, encode, save_student
+
+MAX_LEN = 128
+
+def load_texts(paths):
+    texts, seen = [], set()
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                t = json.loads(line).get("text", "")
+                if t and t not in seen:
+                    seen.add(t)
+                    texts.append(t)
+    return texts
+
+@torch.no_grad()
+def teacher_soft_labels(texts, tok, ner, cls, T, batch_size=16):
+    """返回 [(cls_probs[C], ner_probs[len, K])]，NER 位置对齐方式与 06 的 model_extract 一致。"""
+    out = []
+    for i in range(0, len(texts), batch_size):
+        batch = texts[i:i + batch_size]
+        cls_in = tok(batch, return_tensors="pt", truncation=True, padding="max_length", max_length=MAX_LEN)
+        cls_p = F.softmax(cls(**cls_in).logits / T, dim=-1)
+        ner_in = tok([list(t) for t in batch], return_tensors="pt", is_split_into_words=True,
+                     truncation=True, padding="max_length", max_length=MAX_LEN)
+        ner_p = F.softmax(ner(**ner_in).logits / T, dim=-1)
+        for b, t in enumerate(batch):
+            out.append((cls_p[b], ner_p[b, :min(len(t), MAX_LEN)]))
+    return out
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--in", dest="inp", nargs="+", default=["data/candidates/rule_candidates.jsonl"])
+    ap.add_argument("--exclude", nargs="*", default=["data/labeled/clauses_labeled.jsonl"],
+                    help="这些文件中的文本不参与蒸馏（评测集）")
+    ap.add_argument("--ner", default="models/bert_ner")
+    ap.add_argument("--cls", default="models/bert_clausecls")
+    ap.add_argument("--out", default="models/student")
+    ap.add_argument("--epochs", type=int, default=30)
+    ap.add_argument("--batch-size", dest="batch_size", type=int, default=32)
+    ap.add_argument("--lr", type=float, default=2e-3)
+    ap.add_argument("--temperature", type=float, default=2.0)
+    ap.add_argument("--emb-dim", dest="emb_dim", type=int, default=128)
+    ap.add_argument("--hidden", type=int, default=128)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    for d in (args.ner, args.cls):
+        if not os.path.isdir(d):
+            raise FileNotFoundError(f"教师模型不存在：{d}（请先运行 05_train_ner.py / 05b_train_clause_cls.py）")
+    random.seed(args.seed)
+    torch.manual_seed(args.seed)
+
+    # 候选句是按固定长度切出的片段，与评测句只会部分重合，按子串关系剔除
+    held_out = load_texts(args.exclude)
+    cands = load_texts(args.inp)
+    texts = [c for c in cands if not any(c in g or g in c for g in held_out)]
+    n_excluded = len(cands) - len(texts)
+    print(f"剔除与评测集重叠的文本 {n_excluded} 条")
+    print("无标注文本数量 =", len(texts))
+    if not texts:
+        raise ValueError("没有可用于蒸馏的文本：请先运行 03_filter_rules.py 生成候选句。")
+
+    tok = BertTokenizerFast.from_pretrained("bert-base-chinese")
+    ner = BertForTokenClassification.from_pretrained(args.ner).eval()
+    cls = BertForSequenceClassification.from_pretrained(args.cls).eval()
+    T = args.temperature
+    soft = teacher_soft_labels(texts, tok, ner, cls, T)
+    del ner, cls
+
+    vocab = build_vocab(texts)
+    model = CharStudent(len(vocab), emb_dim=args.emb_dim, hidden=args.hidden)
+    opt = torch.optim.Adam(model.parameters(), lr=args.lr)
+
+    order = list(range(len(texts)))
+    for epoch in range(1, args.epochs + 1):
+        random.shuffle(order)
+        model.train()
+        total = 0.0
+        for i in range(0, len(order), args.batch_size):
+            idx = order[i:i + args.batch_size]
+            ids, lengths = encode([texts[j] for j in idx], vocab, MAX_LEN)
+            tag_logits, cls_logits = model(ids, lengths)
+
+            # 条款分类：KL(teacher || student)，按 Hinton 做 T^2 缩放
+            cls_t = torch.stack([soft[j][0] for j in idx])
+            loss_cls = F.kl_div(F.log_softmax(cls_logits / T, -1), cls_t, reduction="batchmean")
+
+            # 序列标注：只在有效字符位置上计算
+            tag_t = torch.zeros_like(tag_logits)
+            mask = torch.zeros(tag_logits.shape[:2])
+            for b, j in enumerate(idx):
+                n = soft[j][1].size(0)
+                tag_t[b, :n] = soft[j][1]
+                mask[b, :n] = 1.0
+            kl = F.kl_div(F.log_softmax(tag_logits / T, -1), tag_t, reduction="none").sum(-1)
+            loss_tag = (kl * mask).sum() / mask.sum().clamp(min=1.0)
+
+            loss = (loss_cls + loss_tag) * T * T
+            opt.zero_grad()
+            loss.backward()
+            opt.step()
+            total += loss.item() * len(idx)
+        print(f"epoch {epoch}/{args.epochs} loss={total / len(texts):.4f}")
+
+    config = {"emb_dim": args.emb_dim, "hidden": args.hidden, "max_len": MAX_LEN,
+              "temperature": T, "teachers": [args.ner, args.cls], "num_texts": len(texts),
+              "excluded_files": args.exclude, "num_excluded": n_excluded}
+    save_student(args.out, model.eval(), vocab, config)
+    print(f"✅ 蒸馏完成，学生模型已保存到 {args.out}")
+
+if __name__ == "__main__":
+    main()
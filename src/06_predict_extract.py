@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 """
-06_predict_extract.py  (auto: model first, else rule-based)
+06_predict_extract.py  (auto: model first, else rule-based; --backend bert|student|rule 可指定)
 - 输入: data/candidates/rule_candidates.jsonl
 - 输出: outputs/extractions.jsonl
 - 额外: --terms data/termdict/terms.yaml  用于归一化
+- 可选: --out-columnar outputs/extractions.parquet  同时写出列式存储（需要 pyarrow，见 extraction_store.py）
 """
 import argparse, json, os, re, yaml
 
@@ -70,7 +71,7 @@ def try_load_models():
         cls = BertForSequenceClassification.from_pretrained(cls_dir)
         return tok, ner, cls
     except Exception as e:
-        print("[INFO] 模型不可用，使用规则基线。原因：", e)
+        print("[INFO] BERT 模型不可用。原因：", e)
         return None, None, None
 
 LABELS = ["O", "SUBJECT", "ACTION", "OBJECT", "CONDITION", "EXCEPTION"]
@@ -91,7 +92,9 @@ def model_extract(text, tok, ner, cls, terms):
     with torch.no_grad():
         ner_logits = ner(**enc).logits[0]  # [seq_len, num_labels]
         pred_ids = torch.argmax(ner_logits, dim=-1).tolist()
+    return spans_to_info(text, pred_ids, clause_type, terms)
 
+def spans_to_info(text, pred_ids, clause_type, terms):
     # 把连续标签段落成 span，简单合并
     spans_map = {"SUBJECT":[], "ACTION":[], "OBJECT":[], "CONDITION":[], "EXCEPTION":[]}
     cur_lab, cur_start = None, None
@@ -137,30 +140,68 @@ def model_extract(text, tok, ner, cls, terms):
         "exception": excp
     }
 
+# ===== 蒸馏学生模型（05c_distill_student.py 产出） =====
+def try_load_student(model_dir):
+    try:
+        from student_model import load_student
+        return load_student(model_dir)
+    except Exception as e:
+        print("[INFO] 学生模型不可用。原因：", e)
+        return None
+
+def student_extract_batch(texts, student, terms):
+    from student_model import predict
+    model, vocab, config = student
+    return [spans_to_info(t, tags, ct, terms)
+            for t, (ct, tags) in zip(texts, predict(model, vocab, texts, config.get("max_len", 128)))]
+
+def load_backend(backend, student_dir="models/student"):
+    """
+    返回 (名称, 批量抽取函数 texts, terms -> [info])。
+    auto：BERT 可用则用 BERT，否则回退到规则基线；显式指定的 student / bert 不可用时直接报错退出。
+    """
+    if backend == "student":
+        student = try_load_student(student_dir)
+        if student:
+            return "student", lambda texts, terms: student_extract_batch(texts, student, terms)
+    elif backend in ("auto", "bert"):
+        tok, ner, cls = try_load_models()
+        if all([tok, ner, cls]):
+            return "bert", lambda texts, terms: [model_extract(t, tok, ner, cls, terms) for t in texts]
+    if backend not in ("rule", "auto"):
+        raise SystemExit(f"[ERR] 后端 {backend} 不可用（原因见上），未写出任何结果。")
+    return "rule", lambda texts, terms: [rule_based_extract(t, terms) for t in texts]
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--in", dest="inp", required=True)
     ap.add_argument("--terms", dest="terms", required=True)
     ap.add_argument("--out", dest="out", required=True)
+    ap.add_argument("--out-columnar", dest="out_columnar", default=None)
+    ap.add_argument("--row-group-size", dest="row_group_size", type=int, default=4096)
+    ap.add_argument("--backend", choices=["auto", "bert", "student", "rule"], default="auto")
+    ap.add_argument("--student-dir", dest="student_dir", default="models/student")
+    ap.add_argument("--batch-size", dest="batch_size", type=int, default=64)
     args = ap.parse_args()
 
     with open(args.terms, "r", encoding="utf-8") as f:
         terms = yaml.safe_load(f)
 
     os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    if args.out_columnar:
+        os.makedirs(os.path.dirname(args.out_columnar) or ".", exist_ok=True)
 
-    tok, ner, cls = try_load_models()
-    use_model = all([tok, ner, cls])
+    name, extract = load_backend(args.backend, args.student_dir)
+    print(f"[INFO] 抽取后端：{name}")
 
     cnt = 0
-    with open(args.inp, "r", encoding="utf-8") as f, open(args.out, "w", encoding="utf-8") as w:
-        for line in f:
-            obj = json.loads(line)
+    records = []
+
+    def flush(batch, w):
+        nonlocal cnt
+        infos = extract([o["text"] for o in batch], terms)
+        for obj, info in zip(batch, infos):
             text = obj["text"]
-            if use_model:
-                info = model_extract(text, tok, ner, cls, terms)
-            else:
-                info = rule_based_extract(text, terms)
             rec = {
                 "id": f'{obj.get("doc_id","DSLaw")}-cand-{cnt}',
                 "article_no": obj.get("article_no"),
@@ -173,8 +214,25 @@ def main():
                 **info
             }
             w.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            if args.out_columnar:
+                records.append(rec)
             cnt += 1
+
+    with open(args.inp, "r", encoding="utf-8") as f, open(args.out, "w", encoding="utf-8") as w:
+        batch = []
+        for line in f:
+            batch.append(json.loads(line))
+            if len(batch) >= args.batch_size:
+                flush(batch, w)
+                batch = []
+        if batch:
+            flush(batch, w)
     print(f"[OK] Wrote {cnt} extraction(s) → {args.out}")
 
+    if args.out_columnar:
+        from extraction_store import write_columnar
+        write_columnar(records, args.out_columnar, row_group_size=args.row_group_size)
+        print(f"[OK] Wrote columnar extractions → {args.out_columnar}")
+
 if __name__ == "__main__":
     main()
@@ -4,8 +4,21 @@
 Convert extractions.jsonl → policies.json + rules_readable.md
 Usage:
   python src/07_generate_policy.py --in outputs/extractions.jsonl --out-json outputs/policies.json --out-md outputs/rules_readable.md
+  --in 也可以是 06 --out-columnar 写出的 .parquet，此时只读取下面 FIELDS 对应的列（不读 text）
 """
 import argparse, json, os
+from extraction_store import is_columnar, iter_records
+
+# 生成策略与可读规则所需的字段
+FIELDS = ["id", "article_no", "clause_type", "subject", "action", "object", "condition", "exception", "provenance"]
+
+def iter_extractions(path):
+    if is_columnar(path):
+        yield from iter_records(path, FIELDS)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
 
 def to_policy(rec):
     effect = "permit"
@@ -56,12 +69,10 @@ def main():
     os.makedirs(os.path.dirname(args.out_json), exist_ok=True)
     policies = []
     md = []
-    with open(args.inp, "r", encoding="utf-8") as f:
-        for line in f:
-            rec = json.loads(line)
-            pol = to_policy(rec)
-            policies.append(pol)
-            md.append(to_md(rec, pol))
+    for rec in iter_extractions(args.inp):
+        pol = to_policy(rec)
+        policies.append(pol)
+        md.append(to_md(rec, pol))
 
     with open(args.out_json, "w", encoding="utf-8") as w:
         json.dump(policies, w, ensure_ascii=False, indent=2)
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+09_serve_decisions.py
+基于 asyncio 的授权决策服务：加载 07 生成的 policies.json，通过 TCP 提供行分隔 JSON（JSON Lines）接口。
+
+协议（每行一个 JSON，响应按请求顺序逐行返回，可流水线连续发送）：
+  单个请求：{"id": "r1", "subject": {"role": "网络运营者"}, "action": "提供",
+             "resource": {"data_category": "个人信息"}, "env": {"consent": true}}
+  批量请求：把多个请求放进一个 JSON 数组，响应也是同序数组；超过 --max-batch 条时整行返回 {"error": ...}
+  响应：{"id": "r1", "effect": "deny|permit|not_applicable",
+         "policy_ids": [...], "obligations": [...],
+         "provenance": [{"policy_id": ..., "article": ..., "offset": [s, e]}]}
+
+匹配语义（演示版）：
+- subject / action / resource 为空表示不限；"in" 判断请求属性是否在取值列表中
+- exception 中任一属性成立 → 该策略不适用
+- condition：permit/oblig 策略要求条件成立；deny 策略视为“未满足条件才禁止”（如“未经同意不得提供”）
+- 合并：deny 优先；否则有 permit/oblig 命中即 permit（oblig 策略列入 obligations）
+
+使用示例：
+  python src/09_serve_decisions.py --policies outputs/policies.json --host 127.0.0.1 --port 8765
+"""
+import argparse, asyncio, json
+
+ANY = "*"
+
+def attr_match(conds, attrs):
+    """conds 为 [{"attr","op","value"}]，全部成立才返回 True。"""
+    for c in conds:
+        v = attrs.get(c.get("attr"))
+        op = c.get("op")
+        if op == "in":
+            if v not in c.get("value", []):
+                return False
+        elif op == "=":
+            if v != c.get("value"):
+                return False
+        else:
+            return False
+    return True
+
+class PolicyIndex:
+    """按 action 建倒排索引，避免每个请求扫描全部策略。"""
+
+    def __init__(self, policies):
+        self.policies = policies
+        self.by_action = {}
+        for i, p in enumerate(policies):
+            for a in (p.get("action") or [ANY]):
+                self.by_action.setdefault(a, []).append(i)
+        self.wildcard = self.by_action.pop(ANY, [])
+
+    def candidates(self, action):
+        hit = self.by_action.get(action, [])
+        if not self.wildcard: return hit
+        if not hit: return self.wildcard
+        return sorted(set(hit) | set(self.wildcard))
+
+    def applies(self, p, req):
+        if p["subject"] and not attr_match(p["subject"], req.get("subject") or {}):
+            return False
+        if p["resource"] and not attr_match(p["resource"], req.get("resource") or {}):
+            return False
+        env = req.get("env") or {}
+        for e in p.get("exception", []):
+            if attr_match([e], env):
+                return False
+        cond = p.get("condition", [])
+        if cond:
+            met = attr_match(cond, env)
+            if p["effect"] == "deny" and met: return False
+            if p["effect"] != "deny" and not met: return False
+        return True
+
+    def decide(self, req):
+        matched, obligations, provenance = [], [], []
+        deny = permit = False
+        for i in self.candidates(req.get("action")):
+            p = self.policies[i]
+            if not self.applies(p, req):
+                continue
+            matched.append(p["policy_id"])
+            prov = p.get("provenance", {})
+            provenance.append({"policy_id": p["policy_id"],
+                               "article": prov.get("article"),
+                               "offset": prov.get("offset")})
+            if p["effect"] == "deny":
+                deny = True
+            else:
+                permit = True
+                if p["effect"] == "oblig":
+                    obligations.append(p["policy_id"])
+        effect = "deny" if deny else ("permit" if permit else "not_applicable")
+        return {
+            "id": req.get("id"),
+            "effect": effect,
+            "policy_ids": matched,
+            "obligations": obligations,
+            "provenance": provenance
+        }
+
+def load_index(path):
+    with open(path, "r", encoding="utf-8") as f:
+        policies = json.load(f)
+    return PolicyIndex(policies)
+
+def check_request(req):
+    """返回错误信息；请求字段类型合法时返回 None。"""
+    if not isinstance(req, dict):
+        return "request must be an object"
+    if not isinstance(req.get("action"), (str, type(None))):
+        return "action must be a string"
+    for k in ("subject", "resource", "env"):
+        if not isinstance(req.get(k), (dict, type(None))):
+            return f"{k} must be an object"
+    return None
+
+def decide_one(index, req):
+    err = check_request(req)
+    if err:
+        return {"id": req.get("id") if isinstance(req, dict) else None, "error": err}
+    return index.decide(req)
+
+def handle_line(index, line, max_batch):
+    try:
+        msg = json.loads(line)
+    except ValueError as e:
+        return {"error": f"bad json: {e}"}
+    if isinstance(msg, list):
+        # 批量在事件循环上同步计算，限制大小以免一行阻塞其他连接
+        if len(msg) > max_batch:
+            return {"error": f"batch too large: {len(msg)} > {max_batch}"}
+        return [decide_one(index, r) for r in msg]
+    if isinstance(msg, dict):
+        return decide_one(index, msg)
+    return {"error": "request must be an object or an array"}
+
+async def serve_conn(index, max_batch, reader, writer):
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except (asyncio.LimitOverrunError, ValueError):
+                writer.write(b'{"error": "line too long"}\n')
+                break
+            if not line:
+                break
+            if not line.strip():
+                continue
+            try:
+                resp = handle_line(index, line, max_batch)
+            except Exception as e:
+                # 单个请求出错不能断开连接，否则其后流水线中的请求全部丢失
+                resp = {"error": f"internal error: {type(e).__name__}: {e}"}
+            writer.write(json.dumps(resp, ensure_ascii=False).encode("utf-8") + b"\n")
+            # 未超过写缓冲高水位时 drain 立即返回，流水线请求可连续处理
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def run(args):
+    index = load_index(args.policies)
+    server = await asyncio.start_server(
+        lambda r, w: serve_conn(index, args.max_batch, r, w),
+        args.host, args.port, limit=args.max_line_bytes, backlog=args.backlog)
+    addrs = ", ".join(str(s.getsockname()) for s in server.sockets)
+    print(f"[OK] Loaded {len(index.policies)} policies, serving on {addrs}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--policies", dest="policies", required=True)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--backlog", type=int, default=1024)
+    ap.add_argument("--max-line-bytes", dest="max_line_bytes", type=int, default=4 * 1024 * 1024)
+    ap.add_argument("--max-batch", dest="max_batch", type=int, default=1024)
+    args = ap.parse_args()
+    if args.max_batch < 1:
+        ap.error("--max-batch 必须 >= 1")
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+10_loadgen.py
+09 决策服务的本机压测工具：按策略文件随机构造请求，统计吞吐与 p50/p99/p999 延迟。
+
+- --concurrency  并发连接数
+- --pipeline     每个连接上同时在途（未收到响应）的请求行数
+- --batch        每行打包的决策请求数（1 表示单个对象，>1 发送 JSON 数组）
+延迟按“行”统计：从写出该行到读到对应响应行。
+
+使用示例：
+  python src/09_serve_decisions.py --policies outputs/policies.json --port 8765
+  python src/10_loadgen.py --policies outputs/policies.json --port 8765 --concurrency 64 --requests 100000
+"""
+import argparse, asyncio, json, math, random, time
+from collections import deque
+
+def build_requests(policies, n, seed):
+    """从策略中抽取属性组合，约 1/10 为不命中的随机请求。"""
+    rnd = random.Random(seed)
+    roles, actions, cats = set(), set(), set()
+    for p in policies:
+        for c in p.get("subject", []): roles.update(c.get("value", []))
+        actions.update(p.get("action", []))
+        for c in p.get("resource", []): cats.update(c.get("value", []))
+    roles, actions, cats = sorted(roles) or ["-"], sorted(actions) or ["-"], sorted(cats) or ["-"]
+
+    reqs = []
+    for i in range(n):
+        if policies and rnd.random() >= 0.1:
+            p = rnd.choice(policies)
+            subj = [v for c in p.get("subject", []) for v in c.get("value", [])] or roles
+            res = [v for c in p.get("resource", []) for v in c.get("value", [])] or cats
+            act = p.get("action") or actions
+        else:
+            subj, res, act = roles, cats, actions
+        reqs.append({
+            "id": f"r{i}",
+            "subject": {"role": rnd.choice(subj)},
+            "action": rnd.choice(act),
+            "resource": {"data_category": rnd.choice(res)},
+            "env": {"consent": rnd.random() < 0.5,
+                    "law_enforcement_request": rnd.random() < 0.1}
+        })
+    return reqs
+
+def encode_lines(reqs, batch):
+    if batch <= 1:
+        return [json.dumps(r, ensure_ascii=False).encode("utf-8") + b"\n" for r in reqs]
+    return [json.dumps(reqs[i:i + batch], ensure_ascii=False).encode("utf-8") + b"\n"
+            for i in range(0, len(reqs), batch)]
+
+async def worker(host, port, lines, pipeline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port, limit=16 * 1024 * 1024)
+    sent_at = deque()
+    it = iter(lines)
+    done = False
+
+    def fill():
+        nonlocal done
+        while not done and len(sent_at) < pipeline:
+            line = next(it, None)
+            if line is None:
+                done = True
+                break
+            sent_at.append(time.perf_counter())
+            writer.write(line)
+
+    fill()
+    while sent_at:
+        await writer.drain()
+        resp = await reader.readline()
+        if not resp:
+            errors.append("connection closed")
+            break
+        latencies.append(time.perf_counter() - sent_at.popleft())
+        if b'"error"' in resp:
+            errors.append(resp.decode("utf-8", "replace").strip())
+        fill()
+    writer.close()
+    await writer.wait_closed()
+
+def percentile(sorted_xs, q):
+    if not sorted_xs: return float("nan")
+    # nearest-rank
+    k = min(len(sorted_xs) - 1, max(0, math.ceil(q * len(sorted_xs)) - 1))
+    return sorted_xs[k]
+
+async def run(args):
+    with open(args.policies, "r", encoding="utf-8") as f:
+        policies = json.load(f)
+    reqs = build_requests(policies, args.requests, args.seed)
+    lines = encode_lines(reqs, args.batch)
+    shards = [lines[i::args.concurrency] for i in range(args.concurrency)]
+
+    if args.warmup > 0:
+        warm = encode_lines(build_requests(policies, args.warmup, args.seed + 1), args.batch)
+        await asyncio.gather(*(worker(args.host, args.port, warm[i::args.concurrency],
+                                      args.pipeline, [], [])
+                               for i in range(args.concurrency)))
+
+    latencies, errors = [], []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker(args.host, args.port, s, args.pipeline, latencies, errors)
+                           for s in shards))
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    ms = lambda q: percentile(latencies, q) * 1000
+    print(f"concurrency={args.concurrency} pipeline={args.pipeline} batch={args.batch}")
+    print(f"decisions={len(reqs)} lines={len(latencies)} errors={len(errors)} elapsed={elapsed:.3f}s")
+    print(f"throughput={len(reqs) / elapsed:,.0f} decisions/s ({len(latencies) / elapsed:,.0f} lines/s)")
+    print(f"latency per line (ms): p50={ms(0.50):.3f} p99={ms(0.99):.3f} p999={ms(0.999):.3f} max={ms(1.0):.3f}")
+    if errors:
+        print("[WARN] first error:", errors[0])
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--policies", dest="policies", required=True)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--pipeline", type=int, default=1)
+    ap.add_argument("--batch", type=int, default=1)
+    ap.add_argument("--requests", type=int, default=50000)
+    ap.add_argument("--warmup", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    if min(args.concurrency, args.pipeline, args.batch, args.requests) < 1:
+        ap.error("--concurrency/--pipeline/--batch/--requests 必须 >= 1")
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
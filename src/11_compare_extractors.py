@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+11_compare_extractors.py
+对比三种抽取后端（规则基线 / 蒸馏学生模型 / BERT 教师）的速度、内存与准确率。
+- 准确率：在 data/labeled/clauses_labeled.jsonl 上计算条款类型准确率，
+  以及 subject/action/object/condition/exception 归一化取值的 micro P/R/F1
+- 速度：在候选句（rule_candidates.jsonl）上逐批抽取，报告 条/秒
+- 内存：每个后端在独立子进程中加载并运行，报告该子进程的峰值 RSS（MB），以及模型参数占用（MB）
+不可用的后端（如未训练的模型）会在报告中标注并跳过。
+
+使用示例：
+  python src/11_compare_extractors.py --gold data/labeled/clauses_labeled.jsonl --in data/candidates/rule_candidates.jsonl --terms data/termdict/terms.yaml --out outputs/extractor_comparison.md
+"""
+import argparse, importlib, json, os, subprocess, sys, tempfile, time
+import yaml
+
+extract_mod = importlib.import_module("06_predict_extract")
+
+FIELDS = ["subject", "action", "object", "condition", "exception"]
+
+def load_jsonl(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def gold_info(rec, terms):
+    out = {k: set() for k in FIELDS}
+    for sp in rec.get("spans", []):
+        k = sp.get("label", "O").lower()
+        if k in out:
+            out[k].add(extract_mod.normalize_by_terms(sp.get("text", ""), terms.get(f"{k}_alias", {})))
+    return out
+
+def accuracy(extract, gold, terms):
+    infos = extract([g["text"] for g in gold], terms)
+    correct, tp, n_pred, n_gold = 0, 0, 0, 0
+    for g, info in zip(gold, infos):
+        correct += info["clause_type"] == g.get("clause_type", "UNKNOWN")
+        ref = gold_info(g, terms)
+        for k in FIELDS:
+            pred = set(info.get(k, []))
+            tp += len(pred & ref[k])
+            n_pred += len(pred)
+            n_gold += len(ref[k])
+    p = tp / n_pred if n_pred else 0.0
+    r = tp / n_gold if n_gold else 0.0
+    f1 = 2 * p * r / (p + r) if p + r else 0.0
+    return correct / max(len(gold), 1), p, r, f1
+
+def throughput(extract, texts, terms, batch_size, repeat):
+    extract(texts[:batch_size], terms)  # warmup
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for i in range(0, len(texts), batch_size):
+            extract(texts[i:i + batch_size], terms)
+    return len(texts) * repeat / (time.perf_counter() - t0)
+
+def param_mb(*models):
+    return sum(p.numel() * p.element_size() for m in models for p in m.parameters()) / 2**20
+
+BACKENDS = ["rule", "student", "bert"]
+
+def load_one(name, student_dir):
+    """返回 (批量抽取函数, 参数内存 MB)；后端不可用时返回 (None, None)。"""
+    if name == "rule":
+        return (lambda texts, terms: [extract_mod.rule_based_extract(t, terms) for t in texts]), 0.0
+    if name == "student":
+        student = extract_mod.try_load_student(student_dir)
+        if not student:
+            return None, None
+        return (lambda texts, terms: extract_mod.student_extract_batch(texts, student, terms)), param_mb(student[0])
+    tok, ner, cls = extract_mod.try_load_models()
+    if not all([tok, ner, cls]):
+        return None, None
+    ner.eval(); cls.eval()
+    return (lambda texts, terms: [extract_mod.model_extract(t, tok, ner, cls, terms) for t in texts]), param_mb(ner, cls)
+
+def peak_rss_mb():
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 2**20 if sys.platform == "darwin" else rss / 2**10
+    except ImportError:
+        pass
+    try:
+        import psutil  # Windows 无 resource 模块
+        return psutil.Process().memory_info().peak_wset / 2**20
+    except Exception:
+        return None
+
+def run_backend(name, args):
+    """在当前（子）进程中只加载一个后端，返回结果 dict。"""
+    with open(args.terms, "r", encoding="utf-8") as f:
+        terms = yaml.safe_load(f)
+    gold = load_jsonl(args.gold)
+    texts = [r["text"] for r in load_jsonl(args.inp)]
+    extract, mb = load_one(name, args.student_dir)
+    if extract is None:
+        return {"name": name, "available": False}
+    acc, p, r, f1 = accuracy(extract, gold, terms)
+    tps = throughput(extract, texts, terms, args.batch_size, args.repeat)
+    return {"name": name, "available": True, "tps": tps, "param_mb": mb, "rss_mb": peak_rss_mb(),
+            "acc": acc, "p": p, "r": r, "f1": f1}
+
+def student_note(student_dir):
+    """根据学生模型 config.json 说明蒸馏时剔除了多少与评测集重叠的文本。"""
+    try:
+        with open(os.path.join(student_dir, "config.json"), "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except Exception:
+        return "学生模型：未找到 config.json，无法确认蒸馏数据与评测集是否重叠。"
+    if "num_excluded" not in config:
+        return "学生模型：config.json 未记录评测集剔除情况（旧版 05c 产出），其分数可能含训练数据。"
+    return (f"学生模型：05c 蒸馏时剔除了 {config['num_excluded']} 条与 {', '.join(config.get('excluded_files') or []) or '（无）'} "
+            f"重叠的候选句，实际用于蒸馏 {config.get('num_texts')} 条。")
+
+def run_backend_subprocess(name, args):
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        cmd = [sys.executable, os.path.abspath(__file__), "--gold", args.gold, "--in", args.inp,
+               "--terms", args.terms, "--student-dir", args.student_dir,
+               "--batch-size", str(args.batch_size), "--repeat", str(args.repeat),
+               "--only", name, "--result-json", path]
+        if subprocess.run(cmd).returncode != 0:
+            return {"name": name, "available": False}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        os.remove(path)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--gold", default="data/labeled/clauses_labeled.jsonl")
+    ap.add_argument("--in", dest="inp", default="data/candidates/rule_candidates.jsonl")
+    ap.add_argument("--terms", default="data/termdict/terms.yaml")
+    ap.add_argument("--student-dir", dest="student_dir", default="models/student")
+    ap.add_argument("--out", default="outputs/extractor_comparison.md")
+    ap.add_argument("--batch-size", dest="batch_size", type=int, default=64)
+    ap.add_argument("--repeat", type=int, default=3)
+    # 内部使用：子进程只测一个后端，把结果写到 --result-json
+    ap.add_argument("--only", choices=BACKENDS, help=argparse.SUPPRESS)
+    ap.add_argument("--result-json", dest="result_json", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.only:
+        res = run_backend(args.only, args)
+        with open(args.result_json, "w", encoding="utf-8") as w:
+            json.dump(res, w)
+        return
+
+    n_gold, n_texts = len(load_jsonl(args.gold)), len(load_jsonl(args.inp))
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+
+    lines = ["# 抽取后端对比\n",
+             f"金标：{args.gold}（{n_gold} 条）；测速语料：{args.inp}（{n_texts} 条 × {args.repeat}）\n",
+             "注意：BERT 教师（05/05b）即在该金标集上训练，bert 行是训练集分数，不能与其他行直接比较。\n",
+             student_note(args.student_dir) + "\n",
+             "峰值 RSS：每个后端在独立子进程中加载并运行后的进程峰值（含 Python 解释器本身）。\n",
+             "| 后端 | 条/秒 | 峰值 RSS (MB) | 参数内存 (MB) | 条款类型准确率 | 属性 P | 属性 R | 属性 F1 |",
+             "|---|---|---|---|---|---|---|---|"]
+    for name in BACKENDS:
+        res = run_backend_subprocess(name, args)
+        if not res["available"]:
+            lines.append(f"| {name} | 不可用 | - | - | - | - | - | - |")
+            continue
+        rss = f"{res['rss_mb']:.0f}" if res["rss_mb"] is not None else "-"
+        lines.append(f"| {name} | {res['tps']:,.0f} | {rss} | {res['param_mb']:.1f} | {res['acc']:.2f} "
+                     f"| {res['p']:.2f} | {res['r']:.2f} | {res['f1']:.2f} |")
+        print(f"[{name}] {res['tps']:,.0f} texts/s, peak RSS {rss} MB, params {res['param_mb']:.1f} MB, "
+              f"cls acc {res['acc']:.2f}, attr F1 {res['f1']:.2f}")
+
+    with open(args.out, "w", encoding="utf-8") as w:
+        w.write("\n".join(lines) + "\n")
+    print(f"[OK] Wrote comparison report → {args.out}")
+
+if __name__ == "__main__":
+    main()
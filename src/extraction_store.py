@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+extraction_store.py
+extractions 的列式存储（Parquet，需要 pyarrow）。06 可选写出，07 按需只读所需列。
+
+列布局：
+- id / article_no / text / doc / prov_article : string
+- clause_type : dictionary<int8, string>
+- subject / action / object / condition / exception : list<string>
+- offset_start / offset_end : int64（provenance.offset）
+
+每个 row group 的取值集合（zone map）写在文件元数据 abac.zonemap 中，
+按 clause_type / 属性过滤时先跳过不可能命中的 row group，再对读到的行精确过滤。
+
+查询示例（所有提到“个人信息”的 DENY 条款）：
+  python src/extraction_store.py --in outputs/extractions.parquet --clause-type DENY --object 个人信息 --columns id,article_no,text
+"""
+import argparse, json
+
+LIST_FIELDS = ["subject", "action", "object", "condition", "exception"]
+ZONE_FIELDS = ["clause_type"] + LIST_FIELDS
+PROV_COLUMNS = ["doc", "prov_article", "offset_start", "offset_end"]
+ZONEMAP_KEY = b"abac.zonemap"
+
+def _pa():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        import pyarrow.compute as pc
+    except Exception:
+        print("[WARN] pyarrow not installed. Please install it or use the .jsonl output instead.")
+        print("       pip install pyarrow")
+        raise
+    return pa, pq, pc
+
+def is_columnar(path):
+    return path.lower().endswith(".parquet")
+
+def _schema(pa):
+    return pa.schema([
+        ("id", pa.string()),
+        ("article_no", pa.string()),
+        ("text", pa.string()),
+        ("clause_type", pa.dictionary(pa.int8(), pa.string())),
+        *[(k, pa.list_(pa.string())) for k in LIST_FIELDS],
+        ("doc", pa.string()),
+        ("prov_article", pa.string()),
+        ("offset_start", pa.int64()),
+        ("offset_end", pa.int64()),
+    ])
+
+def write_columnar(records, path, row_group_size=4096):
+    """records 为 06 输出的 dict（与 extractions.jsonl 每行相同）。"""
+    pa, pq, _ = _pa()
+    schema = _schema(pa)
+    records = list(records)
+    zonemap = []
+    with pq.ParquetWriter(path, schema, compression="zstd") as w:
+        for i in range(0, max(len(records), 1), row_group_size):
+            chunk = records[i:i + row_group_size]
+            if not chunk: break
+            cols = {k: [r.get(k) for r in chunk] for k in ["id", "article_no", "text", "clause_type"]}
+            for k in LIST_FIELDS:
+                cols[k] = [r.get(k) or [] for r in chunk]
+            provs = [r.get("provenance") or {} for r in chunk]
+            offs = [p.get("offset") or [None, None] for p in provs]
+            cols["doc"] = [p.get("doc") for p in provs]
+            cols["prov_article"] = [p.get("article") for p in provs]
+            cols["offset_start"] = [o[0] for o in offs]
+            cols["offset_end"] = [o[1] for o in offs]
+            # 显式指定，保证一次写入恰好一个 row group，与 zone map 一一对应
+            w.write_table(pa.table(cols, schema=schema), row_group_size=len(chunk))
+            zone = {"clause_type": sorted({c for c in cols["clause_type"] if c})}
+            for k in LIST_FIELDS:
+                zone[k] = sorted({v for vs in cols[k] for v in vs})
+            zonemap.append(zone)
+        w.add_key_value_metadata({ZONEMAP_KEY: json.dumps(zonemap, ensure_ascii=False)})
+    return len(records)
+
+def _physical_columns(fields):
+    cols = []
+    for f in fields:
+        cols += PROV_COLUMNS if f == "provenance" else [f]
+    return cols
+
+def read_columnar(path, fields=None, clause_types=None, contains=None):
+    """
+    只读取 fields 对应的列，返回 pyarrow.Table。
+    - fields：逻辑字段名，"provenance" 展开为 doc/prov_article/offset_start/offset_end；None 表示全部
+    - clause_types：允许的 clause_type 集合
+    - contains：{list 字段: 值}，要求该字段列表中包含该值
+    """
+    pa, pq, pc = _pa()
+    contains = contains or {}
+    pf = pq.ParquetFile(path, memory_map=True)
+    meta = pf.metadata.metadata or {}
+    zonemap = None
+    # 只有带谓词时才解析 zone map（它包含各属性的全部取值，纯列裁剪读取不需要）
+    if (clause_types or contains) and ZONEMAP_KEY in meta:
+        zonemap = json.loads(meta[ZONEMAP_KEY])
+        if len(zonemap) != pf.num_row_groups:
+            zonemap = None  # 与文件的 row group 对不上时不做跳过
+
+    groups = []
+    for g in range(pf.num_row_groups):
+        zone = zonemap[g] if zonemap else None
+        if zone is not None:
+            if clause_types and not set(clause_types) & set(zone["clause_type"]):
+                continue
+            if any(v not in zone.get(k, []) for k, v in contains.items()):
+                continue
+        groups.append(g)
+
+    columns = _physical_columns(fields) if fields else pf.schema_arrow.names
+    extra = [c for c in (["clause_type"] if clause_types else []) + list(contains) if c not in columns]
+    if not groups:
+        return pf.schema_arrow.empty_table().select(columns)
+    table = pf.read_row_groups(groups, columns=columns + extra)
+
+    mask = None
+    if clause_types:
+        mask = pc.is_in(pc.cast(table["clause_type"], pa.string()), value_set=pa.array(list(clause_types)))
+    for k, v in contains.items():
+        col = table[k].combine_chunks()
+        hit = pc.equal(pc.list_flatten(col), v)
+        rows = pc.list_parent_indices(col).filter(hit)
+        m = pc.is_in(pa.array(range(len(table)), pa.int64()), value_set=rows.cast(pa.int64()))
+        mask = m if mask is None else pc.and_(mask, m)
+    if mask is not None:
+        table = table.filter(mask)
+    return table.select(columns)
+
+def iter_records(path, fields=None, clause_types=None, contains=None):
+    """按 extractions.jsonl 的行格式逐条产出 dict（仅含所读字段）。"""
+    table = read_columnar(path, fields, clause_types, contains)
+    has_prov = all(c in table.column_names for c in PROV_COLUMNS)
+    for row in table.to_pylist():
+        if has_prov:
+            row["provenance"] = {
+                "doc": row.pop("doc"),
+                "article": row.pop("prov_article"),
+                "offset": [row.pop("offset_start"), row.pop("offset_end")]
+            }
+        yield row
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--in", dest="inp", required=True)
+    ap.add_argument("--columns", dest="columns", default="id,article_no,clause_type,text")
+    ap.add_argument("--clause-type", dest="clause_type", action="append")
+    for k in LIST_FIELDS:
+        ap.add_argument(f"--{k}", dest=k)
+    args = ap.parse_args()
+
+    contains = {k: getattr(args, k) for k in LIST_FIELDS if getattr(args, k)}
+    cnt = 0
+    for rec in iter_records(args.inp, args.columns.split(","), args.clause_type, contains):
+        print(json.dumps(rec, ensure_ascii=False))
+        cnt += 1
+    print(f"[OK] {cnt} row(s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+student_model.py
+轻量 CPU 抽取学生模型：字符 Embedding + 字符 CNN + BiLSTM，两个输出头
+- 序列标注头：与 models/bert_ner 相同的 6 个字符级标签
+- 条款分类头：与 models/bert_clausecls 相同的 5 个类别
+由 05c_distill_student.py 从两个 BERT 教师蒸馏得到，06 以 --backend student 使用。
+保存目录（默认 models/student/）：student.pt（state_dict）、vocab.json、config.json
+"""
+import json, os
+import torch
+from torch import nn
+
+LABELS = ["O", "SUBJECT", "ACTION", "OBJECT", "CONDITION", "EXCEPTION"]
+CLS_LABELS = ["PERMIT", "DENY", "OBLIG", "EXCEPT", "UNKNOWN"]
+PAD, UNK = "<pad>", "<unk>"
+
+class CharStudent(nn.Module):
+    def __init__(self, vocab_size, emb_dim=128, hidden=128, num_tags=len(LABELS), num_classes=len(CLS_LABELS)):
+        super().__init__()
+        self.emb = nn.Embedding(vocab_size, emb_dim, padding_idx=0)
+        self.conv = nn.Conv1d(emb_dim, emb_dim, kernel_size=3, padding=1)
+        self.lstm = nn.LSTM(emb_dim, hidden, batch_first=True, bidirectional=True)
+        self.tag_head = nn.Linear(2 * hidden, num_tags)
+        self.cls_head = nn.Linear(2 * hidden, num_classes)
+
+    def forward(self, ids, lengths):
+        x = self.emb(ids)
+        x = x + torch.relu(self.conv(x.transpose(1, 2))).transpose(1, 2)
+        packed = nn.utils.rnn.pack_padded_sequence(x, lengths.cpu(), batch_first=True, enforce_sorted=False)
+        h, _ = self.lstm(packed)
+        h, _ = nn.utils.rnn.pad_packed_sequence(h, batch_first=True, total_length=ids.size(1))
+        mask = (ids != 0).unsqueeze(-1).float()
+        pooled = (h * mask).sum(1) / mask.sum(1).clamp(min=1.0)
+        return self.tag_head(h), self.cls_head(pooled)
+
+def build_vocab(texts, min_freq=1):
+    freq = {}
+    for t in texts:
+        for ch in t:
+            freq[ch] = freq.get(ch, 0) + 1
+    chars = sorted(ch for ch, n in freq.items() if n >= min_freq)
+    return {PAD: 0, UNK: 1, **{ch: i + 2 for i, ch in enumerate(chars)}}
+
+def encode(texts, vocab, max_len=128):
+    """字符 → id，返回 (ids[B, L], lengths[B])；空文本长度记 1，避免 pack 报错。"""
+    unk = vocab[UNK]
+    L = max(1, min(max_len, max((len(t) for t in texts), default=1)))
+    ids = torch.zeros((len(texts), L), dtype=torch.long)
+    lengths = torch.ones(len(texts), dtype=torch.long)
+    for b, t in enumerate(texts):
+        t = t[:max_len]
+        if t:
+            ids[b, :len(t)] = torch.tensor([vocab.get(ch, unk) for ch in t])
+            lengths[b] = len(t)
+    return ids, lengths
+
+def save_student(out_dir, model, vocab, config):
+    os.makedirs(out_dir, exist_ok=True)
+    torch.save(model.state_dict(), os.path.join(out_dir, "student.pt"))
+    with open(os.path.join(out_dir, "vocab.json"), "w", encoding="utf-8") as w:
+        json.dump(vocab, w, ensure_ascii=False)
+    with open(os.path.join(out_dir, "config.json"), "w", encoding="utf-8") as w:
+        json.dump(config, w, ensure_ascii=False, indent=2)
+
+def load_student(model_dir):
+    with open(os.path.join(model_dir, "vocab.json"), "r", encoding="utf-8") as f:
+        vocab = json.load(f)
+    with open(os.path.join(model_dir, "config.json"), "r", encoding="utf-8") as f:
+        config = json.load(f)
+    model = CharStudent(len(vocab), emb_dim=config["emb_dim"], hidden=config["hidden"])
+    model.load_state_dict(torch.load(os.path.join(model_dir, "student.pt"), map_location="cpu"))
+    model.eval()
+    return model, vocab, config
+
+@torch.no_grad()
+def predict(model, vocab, texts, max_len=128):
+    """返回每条文本的 (clause_type, 字符级标签 id 列表)。"""
+    ids, lengths = encode(texts, vocab, max_len)
+    tag_logits, cls_logits = model(ids, lengths)
+    tags = tag_logits.argmax(-1).tolist()
+    cls = cls_logits.argmax(-1).tolist()
+    return [(CLS_LABELS[c], tags[b][:int(lengths[b])]) for b, c in enumerate(cls)]